@@ -1,44 +1,194 @@
 import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 import re
 
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 
+try:
+    import connectorx as cx
+except ImportError:  # optional: fall back to pandas + sqlite3
+    cx = None
+
 # --- Load environment variables ---
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+_BASE = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(dotenv_path=os.path.join(_BASE, '..', '..', '.env'))
 DB_PATH = os.getenv("DB_PATH", "src/banking_system.db")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Resolved once per script run instead of on every query
+_DB_FULL_PATH = os.path.abspath(os.path.join(_BASE, '..', '..', DB_PATH))
+_SCHEMA_PATH = os.path.join(_BASE, '..', 'data', 'banking_schema_sqlite.sql')
+
+# Extracts the SQL statement from the model's response
+_SELECT_RE = re.compile(r'\bSELECT\b.*', re.IGNORECASE | re.DOTALL)
+
+# Default number of previous user/assistant exchanges sent to the LLM
+HISTORY_WINDOW = 6
+
+# Results history: queries per page and rows shown before "show all"
+RESULTS_PAGE_SIZE = 10
+RESULTS_PREVIEW_ROWS = 100
+
 # --- Functions ---
 
 @st.cache_data
-def get_schema():
-    """Caches the database schema to avoid reading the file on every run."""
-    schema_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'banking_schema_sqlite.sql')
-    with open(schema_path, 'r') as f:
+def get_schema(schema_mtime):
+    """Caches the database schema to avoid reading the file on every run.
+
+    `schema_mtime` is only used as the cache key, so the file is re-read
+    only when it changes on disk.
+    """
+    with open(_SCHEMA_PATH, 'r') as f:
         return f.read()
 
 def run_query(query):
     """Connects to the DB and runs the given SQL query."""
-    db_full_path = os.path.join(os.path.dirname(__file__), '..', '..', DB_PATH)
-    conn = sqlite3.connect(db_full_path)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+    # The DB file's mtime is part of the cache key so edits to the DB bust the cache
+    return fetch_query_results(query, os.path.getmtime(_DB_FULL_PATH))
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def fetch_query_results(query, db_mtime):
+    """Caches query results keyed on the SQL text and DB file version."""
+    if cx is not None:
+        try:
+            # Rust/Arrow reader, much faster than pandas on larger result sets
+            return cx.read_sql(f"sqlite://{_DB_FULL_PATH}", query, return_type="pandas")
+        except RuntimeError:
+            # connectorx raises on SQL errors and on queries it can't read (UNIONs,
+            # NULL-typed columns); pandas re-runs those and reports any SQLite error
+            pass
+    # The cached connection only serves this fallback (connectorx opens its own).
+    # Streamlit serves sessions from several threads; serialize its use.
+    with get_conn_lock():
+        return pd.read_sql_query(query, get_conn())
+
+@st.cache_resource
+def get_conn():
+    """Opens one read-only SQLite connection shared across reruns (pandas fallback path)."""
+    conn = sqlite3.connect(_DB_FULL_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+@st.cache_resource
+def get_conn_lock():
+    """Lock guarding the shared connection returned by get_conn."""
+    return threading.Lock()
+
+@st.cache_resource
+def get_query_pool():
+    """Worker threads for running queries while the LLM is still streaming."""
+    return ThreadPoolExecutor(max_workers=2)
+
+def extract_sql(response):
+    """Pulls the SQL statement out of the model's response."""
+    match = _SELECT_RE.search(response)
+    sql = match.group(0).strip() if match else response.strip()
+    if sql.endswith(';'):
+        sql = sql[:-1]
+    return sql
+
+def speculate_query(tokens, speculation):
+    """Passes tokens through, starting the query as soon as the SQL statement's `;` has streamed.
+
+    The SQL and its future are stored in `speculation`; callers should only
+    use the future if its SQL matches the final extracted statement.
+    """
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        if (
+            "future" not in speculation
+            and not buffer.startswith("CLARIFICATION:")
+            and buffer.rstrip().endswith(";")
+            and _SELECT_RE.search(buffer)
+        ):
+            speculation["sql"] = extract_sql(buffer)
+            speculation["future"] = get_query_pool().submit(run_query, speculation["sql"])
+        yield token
+
+def add_message(role, content):
+    """Records a chat message for display and appends it to the LLM history."""
+    st.session_state.messages.append({"role": role, "content": content})
+    if role == "user":
+        st.session_state.api_messages.append(HumanMessage(content=content))
+    else:
+        st.session_state.api_messages.append(AIMessage(content=content))
+
+def stream_agent(agent_executor, messages):
+    """Yields the LLM response token by token as it is generated."""
+    events = agent_executor.stream({"messages": messages}, stream_mode="messages")
+    for chunk, metadata in events:
+        # Only the model's own tokens, not other messages emitted by the graph
+        if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == "llm" and chunk.content:
+            yield chunk.content
+
+def trim_history(messages, max_pairs):
+    """Keeps the current exchange plus the `max_pairs` previous ones of the LLM history.
+
+    An exchange starts at a user message and runs up to the next one, so the
+    pending question (and any clarification merged into it) is always kept whole.
+    """
+    start = len(messages)
+    remaining = max_pairs + 1
+    while start > 0 and remaining:
+        start -= 1
+        if isinstance(messages[start], HumanMessage):
+            remaining -= 1
+    return messages[start:]
+
+# LangGraph state
+class State(dict):
+    messages: list
+
+@st.cache_resource
+def get_llm():
+    """Creates the Groq chat model once and shares it across reruns."""
+    return ChatGroq(model="llama-3.1-8b-instant", api_key=GROQ_API_KEY, streaming=True)
+
+@st.cache_resource
+def get_system_message(system_prompt):
+    """Builds the schema system message once instead of on every turn."""
+    return SystemMessage(content=system_prompt)
+
+@st.cache_resource
+def get_agent_executor(system_prompt):
+    """Builds and compiles the LangGraph agent once per system prompt."""
+    llm = get_llm()
+    system_message = get_system_message(system_prompt)
+
+    workflow = StateGraph(State)
+
+    def call_llm(state: State):
+        messages = state["messages"]
+        # Don't send the schema twice when the caller already included it
+        if not messages or messages[0] is not system_message:
+            messages = [system_message] + messages
+        response = llm.invoke(messages)
+        # Only output the new reply: LangGraph's "messages" stream re-emits (and
+        # assigns ids to) every message a node returns, including the history
+        return {"messages": [response]}
+
+    workflow.add_node("llm", call_llm)
+    workflow.set_entry_point("llm")
+    workflow.add_edge("llm", END)
+
+    return llm, workflow.compile()
 
 # --- Agent Setup ---
 
 if not GROQ_API_KEY:
     st.error("❌ No Groq API key found. Please add it to the .env file in the 'code' directory.")
 else:
-    llm = ChatGroq(model="llama-3.1-8b-instant", api_key=GROQ_API_KEY)
-
-    db_schema = get_schema()
+    db_schema = get_schema(os.path.getmtime(_SCHEMA_PATH))
 
     system_prompt = f"""
     You are a highly intelligent SQLite expert. Your task is to convert a user's natural language question into a valid SQLite query.
@@ -49,6 +199,7 @@ else:
     3. NEVER invent columns or tables — only use what is explicitly in the schema.
     4. Use JOINs correctly (e.g., to get a customer's city, JOIN `customers` with `branches`).
     5. Return ONLY the raw SQL query (or a clarification if absolutely needed). No explanations, no markdown.
+    6. Always end the SQL query with a semicolon (`;`).
 
     **Schema:**
     ```sql
@@ -56,28 +207,7 @@ else:
     ```
     """
 
-    # LangGraph state
-    class State(dict):
-        messages: list
-
-    workflow = StateGraph(State)
-
-    def call_llm(state: State):
-        response = llm.invoke([SystemMessage(content=system_prompt)] + state["messages"])
-        return {"messages": state["messages"] + [response]}
-
-    workflow.add_node("llm", call_llm)
-    workflow.set_entry_point("llm")
-    workflow.add_edge("llm", END)
-
-    agent_executor = workflow.compile()
-
-    def run_agent(messages):
-        events = agent_executor.stream({"messages": messages}, stream_mode="values")
-        response = None
-        for event in events:
-            response = event["messages"][-1].content
-        return response
+    SYSTEM_MESSAGE = get_system_message(system_prompt)
 
 # --- UI ---
 
@@ -88,8 +218,13 @@ with st.sidebar:
     st.info("This app uses AI to answer your questions about the bank's database. It remembers the conversation context and asks for clarification if needed.")
     if st.button("Clear Chat History"):
         st.session_state.messages = []
+        st.session_state.api_messages = []
         st.session_state.results = []   # also clear results
         st.rerun()
+    history_window = st.slider(
+        "Previous exchanges sent to the AI", min_value=1, max_value=20, value=HISTORY_WINDOW,
+        help="Older turns are dropped to keep requests small and fast.",
+    )
     st.markdown("---")
     st.header("Example Conversation")
     st.markdown("1. **You:** Show me recent transactions.")
@@ -99,6 +234,9 @@ with st.sidebar:
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+if "api_messages" not in st.session_state:
+    st.session_state.api_messages = []   # LangChain messages sent to the LLM
+
 if "results" not in st.session_state:
     st.session_state.results = []   # store query results persistently
 
@@ -118,58 +256,74 @@ if user_input := st.chat_input("Ask a question about the database..."):
         if "clarification" in last_assistant["content"].lower():
             # Merge clarification answer into previous user query
             st.session_state.messages[-2]["content"] += " " + user_input
+            st.session_state.api_messages[-2] = HumanMessage(content=st.session_state.messages[-2]["content"])
             user_input = None
 
     if user_input:
-        st.session_state.messages.append({"role": "user", "content": user_input})
+        add_message("user", user_input)
         with st.chat_message("user"):
             st.markdown(user_input)
 
     with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking..."):
-            # Build conversation history with schema prompt only once
-            schema_prompt = SystemMessage(content=system_prompt)
-            api_messages = [schema_prompt]
-            for msg in st.session_state.messages:
-                if msg["role"] == "user":
-                    api_messages.append(HumanMessage(content=msg["content"]))
-                elif msg["role"] == "assistant":
-                    api_messages.append(AIMessage(content=msg["content"]))
-
-            response_from_model = run_agent(api_messages)
+        # Conversation history with schema prompt only once
+        api_messages = [SYSTEM_MESSAGE] + trim_history(st.session_state.api_messages, history_window)
+
+        # Show tokens as they arrive, then replace them with the formatted response.
+        # The query starts running as soon as the SQL statement is complete.
+        speculation = {}
+        # Only touch the LLM client and graph once the user actually asks something
+        _, agent_executor = get_agent_executor(system_prompt)
+        stream_placeholder = st.empty()
+        with stream_placeholder.container():
+            response_from_model = st.write_stream(
+                speculate_query(stream_agent(agent_executor, api_messages), speculation)
+            )
+        stream_placeholder.empty()
 
         if response_from_model:
             if response_from_model.startswith("CLARIFICATION:"):
                 clarification_text = response_from_model.replace("CLARIFICATION:", "").strip()
                 st.markdown(clarification_text)
-                st.session_state.messages.append({"role": "assistant", "content": clarification_text})
+                add_message("assistant", clarification_text)
             else:
-                match = re.search(r'SELECT .*', response_from_model, re.IGNORECASE | re.DOTALL)
-                sql = match.group(0).strip() if match else response_from_model.strip()
-                if sql.endswith(';'):
-                    sql = sql[:-1]
+                sql = extract_sql(response_from_model)
                 st.code(sql, language="sql")
                 try:
                     with st.spinner("🔍 Running query..."):
-                        result_df = run_query(sql)
+                        if speculation.get("sql") == sql:
+                            result_df = speculation["future"].result()
+                        else:
+                            result_df = run_query(sql)
 
                     # Save result for history
                     st.session_state.results.append({"sql": sql, "data": result_df})
-                    st.session_state.messages.append({"role": "assistant", "content": sql})
+                    add_message("assistant", sql)
 
                 except Exception as e:
                     error_message = f"Error running query: {e}"
                     st.error(error_message)
-                    st.session_state.messages.append({"role": "assistant", "content": error_message})
+                    add_message("assistant", error_message)
         else:
             warning_message = "Could not generate a response. Please try rephrasing your question."
             st.warning(warning_message)
-            st.session_state.messages.append({"role": "assistant", "content": warning_message})
+            add_message("assistant", warning_message)
 
 # --- Show Results History ---
 if st.session_state.results:
     st.subheader("📊 Query Results History")
-    for i, res in enumerate(st.session_state.results):
-        st.markdown(f"**Query {i+1}:**")
-        st.code(res["sql"], language="sql")
-        st.dataframe(res["data"])
+    results = st.session_state.results
+    page_count = (len(results) - 1) // RESULTS_PAGE_SIZE + 1
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=page_count)
+    start = (page - 1) * RESULTS_PAGE_SIZE
+    for i, res in enumerate(results[start:start + RESULTS_PAGE_SIZE], start=start):
+        # Only the latest result is expanded. Collapsed expanders still send their
+        # contents on every rerun; the page slice and row preview limit the payload
+        with st.expander(f"Query {i+1}: {res['sql'][:60]}", expanded=(i == len(results) - 1)):
+            st.code(res["sql"], language="sql")
+            data = res["data"]
+            if len(data) > RESULTS_PREVIEW_ROWS and not st.toggle(f"Show all {len(data)} rows", key=f"show_all_{i}"):
+                st.caption(f"Showing the first {RESULTS_PREVIEW_ROWS} of {len(data)} rows.")
+                data = data.head(RESULTS_PREVIEW_ROWS)
+            st.dataframe(data)
@@ -12,13 +12,23 @@ data_path = os.path.join(BASE_DIR, 'data', 'banking_data.sql')
 db = sqlite3.connect(os.path.join(BASE_DIR, 'banking_system.db'))
 cursor = db.cursor()
 
-# Run your schema
+# Build-time only: trade durability for bulk-load speed
+cursor.executescript("""
+PRAGMA synchronous=OFF;
+PRAGMA journal_mode=MEMORY;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-200000;
+""")
+
 with open(schema_path, 'r') as f:
-    cursor.executescript(f.read())
+    schema_sql = f.read()
 
-# Run your data inserts
 with open(data_path, 'r') as f:
-    cursor.executescript(f.read())
+    data_sql = f.read()
+
+# Run your schema and data inserts in one explicit transaction
+# (executescript runs in autocommit mode, so BEGIN/COMMIT must be in the script)
+cursor.executescript("BEGIN;\n" + schema_sql + "\n" + data_sql + "\nCOMMIT;")
 
 db.commit()
 db.close()
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from test_executor import TestExecutor
+
+
+class FakeLLM:
+    """Answers the batched prompt with `batch_reply` and singleton prompts with their own SQL"""
+
+    def __init__(self, batch_reply: str):
+        self.batch_reply = batch_reply
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1].content
+        self.calls.append(prompt)
+        if prompt.startswith("Answer each of the following"):
+            return AIMessage(content=self.batch_reply)
+        return AIMessage(content=f"SELECT '{prompt}';")
+
+
+def make_executor(llm) -> TestExecutor:
+    """TestExecutor wired to a fake LLM, without touching Groq or the database"""
+    executor = TestExecutor.__new__(TestExecutor)
+    executor.llm = llm
+    executor.system_prompt = "SCHEMA PROMPT"
+    executor._llm_semaphore = asyncio.Semaphore(10)
+    return executor
+
+
+def test_parse_batch_response_splits_numbered_answers():
+    content = "Here you go:\nA1: SELECT 1;\nA2: SELECT *\nFROM t;\nA3: CLARIFICATION: Which branch?"
+
+    answers = TestExecutor._parse_batch_response(content, 3)
+
+    assert answers == {
+        1: "SELECT 1;",
+        2: "SELECT *\nFROM t;",
+        3: "CLARIFICATION: Which branch?",
+    }
+
+
+def test_parse_batch_response_strips_fences_and_trailing_prose():
+    content = "```sql\nA1: SELECT 1;\nA2: SELECT 2;\n```\nLet me know if you need anything else."
+
+    answers = TestExecutor._parse_batch_response(content, 2)
+
+    assert answers == {1: "SELECT 1;", 2: "SELECT 2;"}
+
+
+@pytest.mark.parametrize("content", [
+    "A1: SELECT 1;\nA5: SELECT 5;",   # out of range
+    "A1: SELECT 1;\nA2:",             # empty answer
+    "A1: SELECT 1;\nA1: SELECT 2;",   # duplicate keeps the first
+])
+def test_parse_batch_response_ignores_unusable_answers(content):
+    assert TestExecutor._parse_batch_response(content, 2) == {1: "SELECT 1;"}
+
+
+def test_generate_sql_batch_falls_back_for_missing_answers():
+    llm = FakeLLM("A1: SELECT 1;\nA3: SELECT 3;")
+    executor = make_executor(llm)
+
+    answers = asyncio.run(executor.agenerate_sql_batch(["q1", "q2", "q3", "q4"]))
+
+    assert answers == ["SELECT 1;", "SELECT 'q2';", "SELECT 3;", "SELECT 'q4';"]
+    assert sorted(llm.calls[1:]) == ["q2", "q4"]
+
+
+def test_generate_sql_batch_falls_back_when_the_batch_call_fails():
+    class FailingBatchLLM(FakeLLM):
+        async def ainvoke(self, messages):
+            if messages[-1].content.startswith("Answer each of the following"):
+                raise RuntimeError("rate limited")
+            return await super().ainvoke(messages)
+
+    executor = make_executor(FailingBatchLLM(""))
+
+    answers = asyncio.run(executor.agenerate_sql_batch(["q1", "q2"]))
+
+    assert answers == ["SELECT 'q1';", "SELECT 'q2';"]
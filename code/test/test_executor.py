@@ -4,14 +4,50 @@ import os
 import datetime
 import json
 import sys
+import logging
+import asyncio
+import threading
+import itertools
 from typing import Dict, List, Any
 from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_groq import ChatGroq
 import re
 from dotenv import load_dotenv
 
-@dataclass
+try:
+    import connectorx as cx
+except ImportError:  # optional: fall back to pandas + sqlite3
+    cx = None
+
+logger = logging.getLogger(__name__)
+
+# Paths resolved once: code/test/ -> code/src/
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_SCHEMA_PATH = os.path.abspath(os.path.join(_TEST_DIR, '..', 'src', 'data', 'banking_schema_sqlite.sql'))
+_DB_PATH = os.path.abspath(os.path.join(_TEST_DIR, '..', 'src', 'banking_system.db'))
+
+# Number of natural language queries packed into a single LLM call
+BATCH_SIZE = 8
+
+# Maximum number of LLM requests in flight at once (Groq rate limits)
+MAX_CONCURRENCY = 10
+
+# Worker threads running generated SQL against the local database
+SQL_WORKERS = 4
+
+# Extracts the SQL statement from the model's response
+_SELECT_RE = re.compile(r'\bSELECT\b.*', re.IGNORECASE | re.DOTALL)
+
+# Matches the `A<n>:` answer markers of a batched LLM response
+_ANSWER_RE = re.compile(r'^\s*A(\d+):', re.MULTILINE)
+
+# Markdown code fences (optionally tagged sql/sqlite) the model may wrap answers in
+_FENCE_RE = re.compile(r'```(?:sqlite|sql)?', re.IGNORECASE)
+
+@dataclass(slots=True)
 class TestResult:
     test_id: str
     query: str
@@ -21,9 +57,11 @@ class TestResult:
     result_count: int
     error_message: str = None
     clarification_requested: bool = False
+    # Wall time of the LLM call(s) that generated this test's SQL, shared by its batch
+    batch_latency: float = 0.0
 
 class TestExecutor:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
         # Use your API key directly for reliability
         self.groq_api_key = "test"
         
@@ -33,27 +71,48 @@ class TestExecutor:
         except Exception as e:
             raise ValueError(f"Failed to initialize ChatGroq: {str(e)}")
             
+        # Resolve the database once instead of probing the filesystem on every query
+        if not os.path.exists(_DB_PATH):
+            raise FileNotFoundError(f"Database not found at: {_DB_PATH}")
+        self._db_path = _DB_PATH
+        logger.debug("Using database at: %s", self._db_path)
+            
         self.db_schema = self.get_schema()
         self.system_prompt = self._create_system_prompt()
+        self._llm_semaphore = asyncio.Semaphore(max_concurrency)
+        # One connection per worker thread: sqlite3 connections are not thread-safe
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._sql_pool = ThreadPoolExecutor(max_workers=SQL_WORKERS)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Shut down the SQL worker pool and close every thread's connection"""
+        self._sql_pool.shutdown(wait=True)
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
     
     def get_schema(self):
         """Load database schema - CORRECTED PATH"""
-        # From code/src/test/ to code/src/data/banking_schema_sqlite.sql
-        schema_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'data', 'banking_schema_sqlite.sql')
+        schema_path = _SCHEMA_PATH
         
-        print(f"🔍 Looking for schema at: {os.path.abspath(schema_path)}")
-        
-        if os.path.exists(schema_path):
-            print(f"✅ Loading schema from: {schema_path}")
-            try:
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    print(f"✅ Schema loaded successfully ({len(content)} characters)")
-                    return content
-            except Exception as e:
-                print(f"❌ Error reading schema: {e}")
-        else:
-            print(f"❌ Schema file not found at: {os.path.abspath(schema_path)}")
+        try:
+            with open(schema_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                logger.debug("Loaded schema from %s (%d characters)", schema_path, len(content))
+                return content
+        except FileNotFoundError:
+            print(f"❌ Schema file not found at: {schema_path}")
+        except Exception as e:
+            print(f"❌ Error reading schema: {e}")
         
         return "-- Schema file not found"
     
@@ -67,6 +126,7 @@ class TestExecutor:
         3. NEVER invent columns or tables — only use what is explicitly in the schema.
         4. Use JOINs correctly (e.g., to get a customer's city, JOIN `customers` with `branches`).
         5. Return ONLY the raw SQL query (or a clarification if absolutely needed). No explanations, no markdown.
+        6. Always end the SQL query with a semicolon (`;`).
 
         **Schema:**
         ```sql
@@ -75,59 +135,144 @@ class TestExecutor:
         """
 
     def run_query(self, query: str):
-        """Execute SQL query against database - CORRECTED PATH"""
-        # CORRECT PATH: From code/src/test/ to code/src/banking_system.db (outside app folder)
-        db_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'banking_system.db')
+        """Execute SQL query against database"""
+        logger.debug("Running query: %s", query)
         
-        print(f"🔍 Looking for database at: {os.path.abspath(db_path)}")
+        if cx is not None:
+            try:
+                # Rust/Arrow reader, much faster than pandas on larger result sets
+                df = cx.read_sql(f"sqlite://{self._db_path}", query, return_type="pandas")
+                return df, None
+            except RuntimeError:
+                # connectorx raises on SQL errors and on queries it can't read (UNIONs,
+                # NULL-typed columns); pandas re-runs those and reports any SQLite error
+                pass
         
-        if not os.path.exists(db_path):
-            # Try absolute path construction as backup
-            current_script_dir = os.path.dirname(os.path.abspath(__file__))
-            alt_db_path = os.path.join(current_script_dir, '..', 'src', 'banking_system.db')
-            alt_db_path = os.path.abspath(alt_db_path)
-            
-            print(f"🔍 Trying alternative absolute path: {alt_db_path}")
-            
-            if os.path.exists(alt_db_path):
-                db_path = alt_db_path
-                print(f"✅ Found database at alternative path")
-            else:
-                return None, f"Database not found at: {os.path.abspath(db_path)} or {alt_db_path}"
-        else:
-            print(f"✅ Found database at: {os.path.abspath(db_path)}")
-                
         try:
-            conn = sqlite3.connect(db_path)
-            df = pd.read_sql_query(query, conn)
-            conn.close()
+            df = pd.read_sql_query(query, self._get_conn())
             return df, None
         except Exception as e:
             return None, str(e)
     
-    def generate_sql(self, natural_query: str):
+    def _get_conn(self):
+        """Open the read-only database connection for this thread once and reuse it
+        
+        Only used by the pandas fallback path; connectorx opens its own connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Each connection is only used by its own thread; check_same_thread=False
+            # just lets close() shut them all down from the main thread
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+    
+    async def agenerate_sql(self, natural_query: str):
         """Convert natural language to SQL using AI"""
         try:
             messages = [
                 SystemMessage(content=self.system_prompt),
                 HumanMessage(content=natural_query)
             ]
-            response = self.llm.invoke(messages)
+            async with self._llm_semaphore:
+                response = await self.llm.ainvoke(messages)
             return response.content
         except Exception as e:
             return f"Error generating SQL: {str(e)}"
     
-    def execute_test_case(self, test_id: str, query: str) -> TestResult:
-        """Execute a single test case"""
+    async def agenerate_sql_batch(self, queries: List[str]) -> List[str]:
+        """Convert several natural language queries to SQL with one AI call
+        
+        The schema prompt is sent once for the whole batch. Answers missing
+        from the batched response are re-generated with concurrent single-query calls.
+        """
+        if len(queries) == 1:
+            return [await self.agenerate_sql(queries[0])]
+        
+        numbered_queries = "".join(f"Q{i}: {q}\n" for i, q in enumerate(queries, 1))
+        batch_prompt = (
+            f"Answer each of the following {len(queries)} questions independently.\n"
+            "For question Q<n>, reply on a new line starting with `A<n>: ` followed by "
+            "the raw SQL query (or the clarification). Do not add anything else.\n\n"
+            f"{numbered_queries}"
+        )
+        
+        answers = {}
+        try:
+            messages = [
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=batch_prompt)
+            ]
+            async with self._llm_semaphore:
+                response = await self.llm.ainvoke(messages)
+            answers = self._parse_batch_response(response.content, len(queries))
+        except Exception as e:
+            print(f"⚠️  Batched SQL generation failed, falling back to single queries: {e}")
+        
+        # Fallback: re-issue singleton calls, concurrently, for anything the batch did not answer
+        missing = [i for i in range(1, len(queries) + 1) if i not in answers]
+        if missing:
+            retried = await asyncio.gather(*(self.agenerate_sql(queries[i - 1]) for i in missing))
+            answers.update(zip(missing, retried))
+        
+        return [answers[i] for i in range(1, len(queries) + 1)]
+    
+    @staticmethod
+    def _parse_batch_response(content: str, expected: int) -> Dict[int, str]:
+        """Split a batched response into {question number: answer}"""
+        parts = _ANSWER_RE.split(content)
+        answers = {}
+        # parts = [preamble, n1, answer1, n2, answer2, ...]
+        for number, answer in zip(parts[1::2], parts[2::2]):
+            index = int(number)
+            answer = TestExecutor._clean_batch_answer(answer)
+            if 1 <= index <= expected and answer and index not in answers:
+                answers[index] = answer
+        return answers
+    
+    @staticmethod
+    def _clean_batch_answer(answer: str) -> str:
+        """Drop code fences and any trailing prose after the SQL statement"""
+        answer = _FENCE_RE.sub('', answer).strip()
+        if not answer.startswith("CLARIFICATION:") and ';' in answer:
+            answer = answer[:answer.index(';') + 1]
+        return answer
+    
+    async def aexecute_test_batch(self, test_cases: List[tuple]) -> List[TestResult]:
+        """Execute a batch of (test_id, query) test cases with one AI call"""
         start_time = datetime.datetime.now()
         
-        # Generate SQL
-        ai_response = self.generate_sql(query)
+        # Generate SQL for the whole batch
+        ai_responses = await self.agenerate_sql_batch([query for _, query in test_cases])
+        batch_latency = (datetime.datetime.now() - start_time).total_seconds()
+        # Attribute an equal share of the generation time to each test case
+        generation_time = batch_latency / len(test_cases)
+        
+        # Run the SQL in parallel on the worker pool, off the event loop
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(self._sql_pool, self.evaluate_response,
+                                 test_id, query, ai_response, generation_time, batch_latency)
+            for (test_id, query), ai_response in zip(test_cases, ai_responses)
+        ))
+    
+    def evaluate_response(self, test_id: str, query: str, ai_response: str,
+                          generation_time: float = 0.0, batch_latency: float = 0.0) -> TestResult:
+        """Run the SQL from an AI response and build the test result
+        
+        `generation_time` is this test's amortized share of `batch_latency`.
+        """
+        start_time = datetime.datetime.now()
         
         # Check if clarification is requested
         if ai_response.startswith("CLARIFICATION:"):
             end_time = datetime.datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            execution_time = generation_time + (end_time - start_time).total_seconds()
             return TestResult(
                 test_id=test_id,
                 query=query,
@@ -135,11 +280,12 @@ class TestExecutor:
                 execution_status="CLARIFICATION_REQUESTED",
                 execution_time=execution_time,
                 result_count=0,
-                clarification_requested=True
+                clarification_requested=True,
+                batch_latency=batch_latency
             )
         
         # Extract SQL from response
-        match = re.search(r'SELECT .*', ai_response, re.IGNORECASE | re.DOTALL)
+        match = _SELECT_RE.search(ai_response)
         sql = match.group(0).strip() if match else ai_response.strip()
         if sql.endswith(';'):
             sql = sql[:-1]
@@ -147,7 +293,7 @@ class TestExecutor:
         # Execute SQL
         result_df, error = self.run_query(sql)
         end_time = datetime.datetime.now()
-        execution_time = (end_time - start_time).total_seconds()
+        execution_time = generation_time + (end_time - start_time).total_seconds()
         
         if error:
             return TestResult(
@@ -157,7 +303,8 @@ class TestExecutor:
                 execution_status="FAILED",
                 execution_time=execution_time,
                 result_count=0,
-                error_message=error
+                error_message=error,
+                batch_latency=batch_latency
             )
         else:
             return TestResult(
@@ -166,22 +313,39 @@ class TestExecutor:
                 generated_sql=sql,
                 execution_status="PASSED",
                 execution_time=execution_time,
-                result_count=len(result_df) if result_df is not None else 0
+                result_count=len(result_df) if result_df is not None else 0,
+                batch_latency=batch_latency
             )
 
 class TestReportGenerator:
+    # Excel sheet written for each execution status
+    STATUS_SHEETS = {
+        "PASSED": "Successful_Tests",
+        "FAILED": "Failed_Tests",
+    }
+    
     def __init__(self, test_results: List[TestResult]):
         self.test_results = test_results
         self.timestamp = datetime.datetime.now()
+        self._detailed_df = self._build_detailed_df()
     
     def generate_summary_stats(self) -> Dict[str, Any]:
         """Generate summary statistics"""
         total_tests = len(self.test_results)
-        passed = len([r for r in self.test_results if r.execution_status == "PASSED"])
-        failed = len([r for r in self.test_results if r.execution_status == "FAILED"])
-        clarification = len([r for r in self.test_results if r.execution_status == "CLARIFICATION_REQUESTED"])
-        
-        avg_execution_time = sum(r.execution_time for r in self.test_results) / total_tests if total_tests > 0 else 0
+        status_counts = Counter()
+        total_time = 0.0
+        total_batch_latency = 0.0
+        for r in self.test_results:
+            status_counts[r.execution_status] += 1
+            total_time += r.execution_time
+            total_batch_latency += r.batch_latency
+        passed = status_counts["PASSED"]
+        failed = status_counts["FAILED"]
+        clarification = status_counts["CLARIFICATION_REQUESTED"]
+        
+        # Execution times include an amortized share of the batch's LLM call
+        avg_execution_time = total_time / total_tests if total_tests > 0 else 0
+        avg_batch_latency = total_batch_latency / total_tests if total_tests > 0 else 0
         
         return {
             "total_tests": total_tests,
@@ -189,11 +353,16 @@ class TestReportGenerator:
             "failed": failed,
             "clarification_requested": clarification,
             "pass_rate": (passed / total_tests * 100) if total_tests > 0 else 0,
-            "average_execution_time": avg_execution_time
+            "average_execution_time": avg_execution_time,
+            "average_batch_latency": avg_batch_latency
         }
     
     def generate_detailed_report(self) -> pd.DataFrame:
         """Generate detailed test results DataFrame"""
+        return self._detailed_df.copy()
+    
+    def _build_detailed_df(self) -> pd.DataFrame:
+        """Build the detailed test results DataFrame once per report"""
         data = []
         for result in self.test_results:
             data.append({
@@ -202,6 +371,7 @@ class TestReportGenerator:
                 "Generated_SQL": result.generated_sql,
                 "Execution_Status": result.execution_status,
                 "Execution_Time_Seconds": result.execution_time,
+                "Batch_Latency_Seconds": result.batch_latency,
                 "Result_Count": result.result_count,
                 "Error_Message": result.error_message,
                 "Clarification_Requested": result.clarification_requested
@@ -211,15 +381,8 @@ class TestReportGenerator:
     def save_html_report(self, filename: str):
         """Generate and save HTML report"""
         summary = self.generate_summary_stats()
-        detailed_df = self.generate_detailed_report()
         
-        # Truncate long SQL queries for HTML display
-        detailed_df_display = detailed_df.copy()
-        detailed_df_display['Generated_SQL'] = detailed_df_display['Generated_SQL'].apply(
-            lambda x: x[:150] + "..." if len(str(x)) > 150 else x
-        )
-        
-        html_content = f"""
+        html_header = f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -266,7 +429,8 @@ class TestReportGenerator:
                             <tr><td>Failed Executions</td><td class="status-failed metric-value">{summary['failed']}</td></tr>
                             <tr><td>Clarifications Needed</td><td class="status-clarification metric-value">{summary['clarification_requested']}</td></tr>
                             <tr><td>Success Rate</td><td class="metric-value" style="color: {'#28a745' if summary['pass_rate'] >= 80 else '#ffc107' if summary['pass_rate'] >= 60 else '#dc3545'};">{summary['pass_rate']:.1f}%</td></tr>
-                            <tr><td>Average Response Time</td><td class="metric-value">{summary['average_execution_time']:.3f}s</td></tr>
+                            <tr><td>Average Response Time (amortized per query)</td><td class="metric-value">{summary['average_execution_time']:.3f}s</td></tr>
+                            <tr><td>Average LLM Batch Latency</td><td class="metric-value">{summary['average_batch_latency']:.3f}s</td></tr>
                         </table>
                         
                         <div class="highlight">
@@ -278,7 +442,9 @@ class TestReportGenerator:
                     
                     <div class="detailed">
                         <h2>📋 Detailed Test Results</h2>
-                        {detailed_df_display.to_html(classes='detailed-table', escape=False, index=False)}
+        """
+        
+        html_footer = """
                     </div>
                 </div>
             </div>
@@ -286,11 +452,27 @@ class TestReportGenerator:
         </html>
         """
         
+        # Stream the report to disk; pandas writes the results table straight into the file
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(html_header)
+            self._detailed_df.to_html(
+                buf=f,
+                classes='detailed-table',
+                escape=False,
+                index=False,
+                # Truncate long SQL queries for HTML display
+                formatters={'Generated_SQL': self._truncate_sql},
+            )
+            f.write(html_footer)
         
         return filename
     
+    @staticmethod
+    def _truncate_sql(sql) -> str:
+        """Shorten long SQL queries for the HTML table"""
+        sql = str(sql)
+        return sql[:150] + "..." if len(sql) > 150 else sql
+    
     def save_excel_report(self, filename: str):
         """Save detailed results to Excel"""
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -299,23 +481,71 @@ class TestReportGenerator:
             summary_df.to_excel(writer, sheet_name='Executive_Summary', index=False)
             
             # All results sheet
-            detailed_df = self.generate_detailed_report()
-            detailed_df.to_excel(writer, sheet_name='All_Test_Results', index=False)
-            
-            # Passed tests sheet
-            passed_tests = detailed_df[detailed_df['Execution_Status'] == 'PASSED']
-            if not passed_tests.empty:
-                passed_tests.to_excel(writer, sheet_name='Successful_Tests', index=False)
+            self._detailed_df.to_excel(writer, sheet_name='All_Test_Results', index=False)
             
-            # Failed tests sheet
-            failed_tests = detailed_df[detailed_df['Execution_Status'] == 'FAILED']
-            if not failed_tests.empty:
-                failed_tests.to_excel(writer, sheet_name='Failed_Tests', index=False)
+            # One sheet per status (passed / failed tests), grouped in a single pass
+            status_groups = dict(tuple(self._detailed_df.groupby('Execution_Status', sort=False)))
+            for status, sheet_name in self.STATUS_SHEETS.items():
+                if status in status_groups:
+                    status_groups[status].to_excel(writer, sheet_name=sheet_name, index=False)
         
         return filename
 
-def main():
+async def run_test_suite(executor: TestExecutor, test_cases_df: pd.DataFrame) -> List[TestResult]:
+    """Execute all test cases, printing each result as it is collected"""
+    test_results = []
+    
+    test_cases = [
+        (str(row['Test Case ID']), row['Natural Language Query'])
+        for _, row in test_cases_df.iterrows()
+    ]
+    
+    # Send the queries to the LLM in batches of BATCH_SIZE, all batches concurrently
+    test_cases_iter = iter(test_cases)
+    batches = []
+    while batch := list(itertools.islice(test_cases_iter, BATCH_SIZE)):
+        batches.append(batch)
+    
+    tasks = [executor.aexecute_test_batch(batch) for batch in batches]
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    for batch, batch_results in zip(batches, responses):
+        if isinstance(batch_results, Exception):
+            batch_results = [
+                TestResult(
+                    test_id=test_id,
+                    query=query,
+                    generated_sql="",
+                    execution_status="FAILED",
+                    execution_time=0.0,
+                    result_count=0,
+                    error_message=str(batch_results)
+                )
+                for test_id, query in batch
+            ]
+        
+        for (test_id, query), result in zip(batch, batch_results):
+            test_results.append(result)
+            
+            print(f"Test {test_id:>2}/{len(test_cases)}: {query[:70]}{'...' if len(query) > 70 else ''}")
+            
+            # Detailed status reporting
+            if result.execution_status == "PASSED":
+                print(f"         ✅ SUCCESS ({result.execution_time:.2f}s) → {result.result_count} rows returned")
+            elif result.execution_status == "FAILED":
+                print(f"         ❌ FAILED ({result.execution_time:.2f}s)")
+                if result.error_message and len(result.error_message) < 80:
+                    print(f"         💬 Error: {result.error_message}")
+            else:
+                print(f"         ❓ CLARIFICATION ({result.execution_time:.2f}s)")
+    
+    return test_results
+
+async def main():
     """Main test execution function"""
+    if os.getenv("DEBUG"):
+        logging.basicConfig(level=logging.DEBUG)
+    
     try:
         print("=" * 100)
         print("🏦 BANKING AI ASSISTANT COMPREHENSIVE TEST SUITE")
@@ -335,50 +565,32 @@ def main():
         test_cases_df = pd.read_excel(test_cases_path)
         print(f"✅ Loaded {len(test_cases_df)} comprehensive test cases")
         
-        # Initialize test executor
-        print(f"\n🚀 Initializing Banking AI Test Framework...")
-        executor = TestExecutor()
-        
         # Create reports directory
         reports_dir = os.path.join(current_dir, 'reports')
         os.makedirs(reports_dir, exist_ok=True)
         print(f"📂 Reports will be saved to: {reports_dir}")
         
-        # Test database connection first
-        print(f"\n🔍 Verifying database connectivity...")
-        test_df, error = executor.run_query("SELECT name FROM sqlite_master WHERE type='table' LIMIT 10")
-        if error:
-            print(f"❌ Database connection failed: {error}")
-            return
-        else:
-            print(f"✅ Database connection established successfully!")
-            if test_df is not None and not test_df.empty:
-                print(f"📋 Found {len(test_df)} tables: {', '.join(list(test_df['name']))}")
+        # Initialize test executor
+        print(f"\n🚀 Initializing Banking AI Test Framework...")
+        with TestExecutor() as executor:
+            # Test database connection first
+            print(f"\n🔍 Verifying database connectivity...")
+            test_df, error = executor.run_query("SELECT name FROM sqlite_master WHERE type='table' LIMIT 10")
+            if error:
+                print(f"❌ Database connection failed: {error}")
+                return
             else:
-                print(f"⚠️  Database is empty - no tables found")
-        
-        # Execute all test cases
-        print(f"\n🧪 Executing comprehensive test suite ({len(test_cases_df)} test cases)...")
-        print("=" * 100)
-        test_results = []
-        
-        for i, row in test_cases_df.iterrows():
-            test_id = str(row['Test Case ID'])
-            query = row['Natural Language Query']
+                print(f"✅ Database connection established successfully!")
+                if test_df is not None and not test_df.empty:
+                    print(f"📋 Found {len(test_df)} tables: {', '.join(list(test_df['name']))}")
+                else:
+                    print(f"⚠️  Database is empty - no tables found")
             
-            print(f"Test {test_id:>2}/35: {query[:70]}{'...' if len(query) > 70 else ''}")
-            result = executor.execute_test_case(test_id, query)
-            test_results.append(result)
+            # Execute all test cases
+            print(f"\n🧪 Executing comprehensive test suite ({len(test_cases_df)} test cases)...")
+            print("=" * 100)
             
-            # Detailed status reporting
-            if result.execution_status == "PASSED":
-                print(f"         ✅ SUCCESS ({result.execution_time:.2f}s) → {result.result_count} rows returned")
-            elif result.execution_status == "FAILED":
-                print(f"         ❌ FAILED ({result.execution_time:.2f}s)")
-                if result.error_message and len(result.error_message) < 80:
-                    print(f"         💬 Error: {result.error_message}")
-            else:
-                print(f"         ❓ CLARIFICATION ({result.execution_time:.2f}s)")
+            test_results = await run_test_suite(executor, test_cases_df)
         
         print("=" * 100)
         print("🏁 Test suite execution completed!")
@@ -410,7 +622,8 @@ def main():
         print(f"❌ Failed Executions:            {summary['failed']} ({summary['failed']/summary['total_tests']*100:.1f}%)")
         print(f"❓ Clarifications Required:      {summary['clarification_requested']} ({summary['clarification_requested']/summary['total_tests']*100:.1f}%)")
         print(f"🎯 Overall Success Rate:         {summary['pass_rate']:.1f}%")
-        print(f"⚡ Average Response Time:        {summary['average_execution_time']:.3f} seconds")
+        print(f"⚡ Average Response Time:        {summary['average_execution_time']:.3f} seconds (amortized per query)")
+        print(f"⏱️  Average LLM Batch Latency:    {summary['average_batch_latency']:.3f} seconds")
         print("=" * 100)
         
         # Performance categorization
@@ -433,4 +646,4 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
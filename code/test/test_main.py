@@ -0,0 +1,113 @@
+import importlib
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+@pytest.fixture
+def main(monkeypatch):
+    """Import the Streamlit app in bare mode, without a Groq API key"""
+    monkeypatch.setenv("GROQ_API_KEY", "")
+    return importlib.import_module("app.main")
+
+
+def build_agent(main, monkeypatch, response: str):
+    """Compile the agent graph around a fake chat model returning `response`"""
+    fake_llm = GenericFakeChatModel(messages=iter([AIMessage(content=response)]))
+    monkeypatch.setattr(main, "get_llm", lambda: fake_llm)
+    main.get_agent_executor.clear()
+    _, agent_executor = main.get_agent_executor("SCHEMA PROMPT")
+    main.get_agent_executor.clear()
+    return agent_executor
+
+
+def test_stream_agent_yields_only_model_tokens(main, monkeypatch):
+    sql = "SELECT name, city FROM branches LIMIT 3;"
+    agent_executor = build_agent(main, monkeypatch, sql)
+    system_message = main.get_system_message("SCHEMA PROMPT")
+    history = [
+        HumanMessage(content="Show me recent transactions."),
+        AIMessage(content="What timeframe do you consider 'recent'?"),
+        HumanMessage(content="Show me three branches"),
+    ]
+
+    streamed = "".join(main.stream_agent(agent_executor, [system_message] + history))
+
+    assert streamed == sql
+    # The cached system message and session history must not be mutated
+    assert system_message.id is None
+    assert all(message.id is None for message in history)
+
+
+def conversation(exchanges: int):
+    """Build `exchanges` complete question/answer pairs"""
+    history = []
+    for i in range(exchanges):
+        history += [HumanMessage(content=f"Q{i}"), AIMessage(content=f"A{i}")]
+    return history
+
+
+def test_trim_history_keeps_new_question_and_previous_exchanges(main):
+    history = conversation(5) + [HumanMessage(content="new question")]
+
+    trimmed = main.trim_history(history, 2)
+
+    assert [m.content for m in trimmed] == ["Q3", "A3", "Q4", "A4", "new question"]
+
+
+def test_trim_history_counts_merged_clarification_as_current_exchange(main):
+    # After a clarification merge the history ends with the clarification reply
+    history = conversation(5) + [
+        HumanMessage(content="recent transactions in the last 7 days"),
+        AIMessage(content="What timeframe do you consider 'recent'?"),
+    ]
+
+    trimmed = main.trim_history(history, 2)
+
+    assert [m.content for m in trimmed] == [
+        "Q3", "A3", "Q4", "A4",
+        "recent transactions in the last 7 days",
+        "What timeframe do you consider 'recent'?",
+    ]
+
+
+def test_trim_history_short_conversation_is_kept_whole(main):
+    history = conversation(1) + [HumanMessage(content="new question")]
+
+    assert main.trim_history(history, 6) == history
+
+
+class RecordingPool:
+    """Stands in for the query pool, recording submitted queries"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, sql):
+        self.submitted.append(sql)
+        return sql
+
+
+def test_speculate_query_waits_for_the_terminating_semicolon(main, monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(main, "get_query_pool", lambda: pool)
+    tokens = ["SELECT a", "\n", "\n", "FROM t", ";"]
+    speculation = {}
+
+    streamed = "".join(main.speculate_query(iter(tokens), speculation))
+
+    assert streamed == "SELECT a\n\nFROM t;"
+    assert pool.submitted == ["SELECT a\n\nFROM t"]
+    assert speculation["sql"] == main.extract_sql(streamed)
+
+
+def test_speculate_query_skips_clarifications(main, monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(main, "get_query_pool", lambda: pool)
+    speculation = {}
+
+    list(main.speculate_query(iter(["CLARIFICATION: ", "SELECT which branch?;"]), speculation))
+
+    assert pool.submitted == []
+    assert speculation == {}